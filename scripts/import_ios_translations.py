@@ -14,13 +14,21 @@ Generates:
   - app/src/main/res/values-XX/strings.xml for each target language
 """
 
+import functools
 import json
+import multiprocessing
 import os
 import re
 import sys
-import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 
+try:
+    # orjson decodes the (large) xcstrings JSON 2-3x faster than stdlib json.
+    import orjson
+except ImportError:
+    orjson = None
+
 # Android locale directory mapping
 ANDROID_LOCALE_DIRS = {
     "de": "values-de",
@@ -37,33 +45,73 @@ ANDROID_LOCALE_DIRS = {
     "zh-Hans": "values-b+zh+Hans",
     "zh-Hant": "values-b+zh+Hant",
 }
+# Language codes are dict keys in every per-language structure; interned
+# strings hit the pointer-identity fast path on lookup.
+ANDROID_LOCALE_DIRS = {
+    sys.intern(lang): dir_name for lang, dir_name in ANDROID_LOCALE_DIRS.items()
+}
 
-def convert_ios_format_to_android(text: str) -> str:
-    """Convert iOS format specifiers to Android format specifiers."""
-    if not text:
-        return text
+# Precompiled patterns - these run thousands of times per language, so skip
+# the re-module cache lookup on every call.
+_RE_WS = re.compile(r'\s+')
 
-    result = text
+# Format-specifier conversion, fused into one alternation each way so a
+# string is rewritten in a single pass instead of 6+ .replace()/re.sub calls.
+_RE_IOS_FMT = re.compile(r'%(\d+)\$@|%@|%lld|%llu|%ld|%lu|%li')
+_RE_ANDROID_FMT = re.compile(r'%(\d+)\$([sd])|%s|%d')
 
-    # Convert positional %1$@ -> %1$s, %2$@ -> %2$s etc.
-    result = re.sub(r'%(\d+)\$@', r'%\1$s', result)
 
-    # Convert %@ -> %s (non-positional)
-    result = result.replace('%@', '%s')
+def _ios_fmt_repl(m: re.Match) -> str:
+    position = m.group(1)
+    if position:
+        return f'%{position}$s'
+    return '%s' if m.group(0) == '%@' else '%d'
 
-    # Convert %lld -> %d
-    result = result.replace('%lld', '%d')
-    result = result.replace('%ld', '%d')
-    result = result.replace('%llu', '%d')
-    result = result.replace('%lu', '%d')
 
-    # Convert %li -> %d
-    result = result.replace('%li', '%d')
+def _android_fmt_repl(m: re.Match) -> str:
+    position = m.group(1)
+    if position:
+        return f'%{position}$@' if m.group(2) == 's' else f'%{position}$lld'
+    return '%@' if m.group(0) == '%s' else '%lld'
 
-    # Convert %.0f -> %.0f (same in Android)
-    # Convert %f -> %f (same)
 
-    return result
+def convert_android_to_ios_format(text: str) -> str:
+    """Convert Android format specifiers to iOS form for key matching."""
+    if not text:
+        return text
+    return _RE_ANDROID_FMT.sub(_android_fmt_repl, text)
+
+# Single-pass escape/unescape tables (one string copy instead of one per
+# .replace() call).
+_ESCAPE_TABLE = str.maketrans({
+    '&': '&amp;',
+    '<': '&lt;',
+    '>': '&gt;',
+    "'": "\\'",
+    '"': '\\"',
+})
+_RE_UNESCAPE = re.compile(r"\\'|\\\"|&amp;|&lt;|&gt;")
+_UNESCAPE_MAP = {
+    "\\'": "'",
+    '\\"': '"',
+    '&amp;': '&',
+    '&lt;': '<',
+    '&gt;': '>',
+}
+
+@functools.lru_cache(maxsize=4096)
+def convert_ios_format_to_android(text: str) -> str:
+    """Convert iOS format specifiers to Android format specifiers.
+
+    Memoized: common values ("OK", "Cancel", ...) recur across entries and
+    languages, and the inputs are immutable strings.
+    """
+    if not text:
+        return text
+
+    # %1$@ -> %1$s, %@ -> %s, %lld/%ld/%llu/%lu/%li -> %d.
+    # %.0f / %f are the same in Android and pass through untouched.
+    return _RE_IOS_FMT.sub(_ios_fmt_repl, text)
 
 
 def escape_android_xml(text: str) -> str:
@@ -71,15 +119,7 @@ def escape_android_xml(text: str) -> str:
     if not text:
         return text
 
-    # Replace & first (before other entities)
-    text = text.replace('&', '&amp;')
-    # Replace < and >
-    text = text.replace('<', '&lt;')
-    text = text.replace('>', '&gt;')
-    # Escape apostrophes
-    text = text.replace("'", "\\'")
-    # Escape double quotes
-    text = text.replace('"', '\\"')
+    text = text.translate(_ESCAPE_TABLE)
     # Escape @ at start
     if text.startswith('@'):
         text = '\\' + text
@@ -89,11 +129,7 @@ def escape_android_xml(text: str) -> str:
 
 def unescape_android_xml(text: str) -> str:
     """Unescape Android XML to get raw text for matching."""
-    text = text.replace("\\'", "'")
-    text = text.replace('\\"', '"')
-    text = text.replace('&amp;', '&')
-    text = text.replace('&lt;', '<')
-    text = text.replace('&gt;', '>')
+    text = _RE_UNESCAPE.sub(lambda m: _UNESCAPE_MAP[m.group(0)], text)
     if text.startswith('\\@'):
         text = text[1:]
     return text
@@ -104,156 +140,210 @@ def normalize_for_matching(text: str) -> str:
     # Strip whitespace
     text = text.strip()
     # Normalize whitespace
-    text = re.sub(r'\s+', ' ', text)
+    text = _RE_WS.sub(' ', text)
     return text
 
 
-def parse_android_strings(filepath: str) -> dict:
-    """Parse Android strings.xml and return {name: english_value} dict."""
-    tree = ET.parse(filepath)
-    root = tree.getroot()
-
-    strings = {}
-    for elem in root:
-        if elem.tag == 'string':
-            name = elem.get('name')
-            # Get text content, handling mixed content
-            text = elem.text or ''
-            # Also handle tail text from child elements
-            for child in elem:
-                text += ET.tostring(child, encoding='unicode')
-            strings[name] = text
-        elif elem.tag == 'plurals':
-            # Skip plurals for now - handle separately if needed
-            pass
-
-    return strings
+# Targeted extractor for the narrow strings.xml schema: <string> entries
+# with at most simple inline formatting tags. No DOM construction needed.
+_RE_XML_COMMENT = re.compile(r'<!--.*?-->', re.DOTALL)
+_RE_PLURALS_BLOCK = re.compile(r'<plurals\b.*?</plurals>', re.DOTALL)
+_RE_STRING_ENTRY = re.compile(r'<string\s+name="([^"]+)"[^>]*>(.*?)</string>', re.DOTALL)
+# Standard XML entities the DOM parser used to decode for us. &amp; first so
+# double-encoded text resolves the same way an XML parser would.
+_RE_XML_ENTITY = re.compile(r'&amp;|&lt;|&gt;|&quot;|&apos;')
+_XML_ENTITY_MAP = {
+    '&amp;': '&',
+    '&lt;': '<',
+    '&gt;': '>',
+    '&quot;': '"',
+    '&apos;': "'",
+}
 
 
-def build_english_to_android_map(android_strings: dict) -> dict:
-    """Build a mapping from English text -> Android resource name.
+def parse_android_strings(filepath: str) -> dict:
+    """Parse Android strings.xml and return {name: english_value} dict.
 
-    Since iOS uses the English text as the key, we need to match
-    Android English values back to their resource names.
+    strings.xml is narrow enough (flat <string> entries, occasional inline
+    formatting tags, <plurals> blocks we skip) that a compiled regex pulls
+    out (name, value) pairs in one pass - no DOM build, walk or
+    reserialization. Entities are decoded to match what ElementTree
+    returned.
     """
-    # Map: normalized English text -> list of (android_name, raw_english)
-    text_to_names = {}
-    for name, english in android_strings.items():
-        raw = unescape_android_xml(english)
-        # Convert Android format specifiers back to generic for matching
-        generic = raw.replace('%s', '%@').replace('%d', '%lld')
-        generic = re.sub(r'%(\d+)\$s', r'%\1$@', generic)
-        generic = re.sub(r'%(\d+)\$d', r'%\1$lld', generic)
-
-        normalized = normalize_for_matching(raw)
-        normalized_generic = normalize_for_matching(generic)
+    text = Path(filepath).read_text(encoding='utf-8')
+    text = _RE_XML_COMMENT.sub('', text)
+    # Skip plurals for now - handle separately if needed
+    text = _RE_PLURALS_BLOCK.sub('', text)
 
-        if normalized not in text_to_names:
-            text_to_names[normalized] = []
-        text_to_names[normalized].append(name)
-
-        if normalized_generic != normalized:
-            if normalized_generic not in text_to_names:
-                text_to_names[normalized_generic] = []
-            text_to_names[normalized_generic].append(name)
+    strings = {}
+    for name, value in _RE_STRING_ENTRY.findall(text):
+        value = _RE_XML_ENTITY.sub(lambda m: _XML_ENTITY_MAP[m.group(0)], value)
+        # Resource names are reused as dict keys across all 13 languages;
+        # interning makes those lookups pointer comparisons.
+        strings[sys.intern(name)] = value
 
-    return text_to_names
+    return strings
 
 
 def load_ios_translations(xcstrings_path: str) -> dict:
     """Load iOS xcstrings file. Returns the strings dict."""
-    with open(xcstrings_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    raw = Path(xcstrings_path).read_bytes()
+    data = orjson.loads(raw) if orjson is not None else json.loads(raw)
     return data.get('strings', {})
 
 
-def generate_translated_strings_xml(
-    android_strings: dict,
-    ios_strings: dict,
-    target_lang: str,
-    text_to_names: dict
-) -> str:
-    """Generate a translated strings.xml for the given language."""
+def prepare_android_entries(android_strings: dict) -> list:
+    """Precompute the lookup keys per unique English value.
 
-    # Build translations: android_name -> translated_text
-    translations = {}
-    matched_count = 0
-    unmatched_names = []
+    Resources often share English text ("OK", "Cancel", reused action
+    labels), so entries are grouped by raw English: each text is resolved
+    once per language and the result broadcast to every name sharing it.
 
+    Returns [(names, raw_english, normalized_key, ios_format_key), ...] so
+    the per-language pass is pure dict lookups with no string transforms.
+    """
+    grouped = {}
+    entries = []
     for android_name, english_value in android_strings.items():
         if android_name == 'app_name':
             # Don't translate app name
             continue
 
         raw_english = unescape_android_xml(english_value)
+        entry = grouped.get(raw_english)
+        if entry is not None:
+            entry[0].append(android_name)
+            continue
 
-        # Try direct match with iOS key (which is the English text)
-        ios_key = raw_english
-        normalized_key = normalize_for_matching(ios_key)
+        normalized_key = normalize_for_matching(raw_english)
 
-        translated = None
+        # Android format specifiers converted to iOS form for matching.
+        # None when the string has no specifiers - the lookup would just
+        # repeat the exact match, so the per-language pass skips it.
+        ios_format = convert_android_to_ios_format(raw_english)
+        if ios_format == raw_english:
+            ios_format = None
 
-        # Try exact match
-        if ios_key in ios_strings:
-            locs = ios_strings[ios_key].get('localizations', {})
-            loc = locs.get(target_lang, {})
-            su = loc.get('stringUnit', {})
-            if su.get('value'):
-                translated = su['value']
+        entry = ([android_name], raw_english, normalized_key, ios_format)
+        grouped[raw_english] = entry
+        entries.append(entry)
+    return entries
 
-        # Try normalized match
-        if not translated:
-            for ios_key_candidate, ios_value in ios_strings.items():
-                if normalize_for_matching(ios_key_candidate) == normalized_key:
-                    locs = ios_value.get('localizations', {})
-                    loc = locs.get(target_lang, {})
-                    su = loc.get('stringUnit', {})
-                    if su.get('value'):
-                        translated = su['value']
-                        break
+
+def build_normalized_ios_map(ios_strings: dict) -> dict:
+    """Build a normalized iOS key -> [iOS keys] dict for O(1) fuzzy lookups.
+
+    Keeps a list per normalized key (in original key order) because distinct
+    iOS keys can normalize to the same text and an earlier one may be missing
+    a given language.
+    """
+    ios_by_normalized = {}
+    for ios_key in ios_strings:
+        normalized = normalize_for_matching(ios_key)
+        ios_by_normalized.setdefault(normalized, []).append(ios_key)
+    return ios_by_normalized
+
+
+def build_translations_by_lang(ios_strings: dict) -> dict:
+    """Transpose iOS data to {lang: {ios_key: translated_value}}.
+
+    One flat .get() per lookup in the hot loop instead of chaining through
+    localizations/stringUnit dicts for every entry and language.
+    """
+    by_lang = {lang: {} for lang in ANDROID_LOCALE_DIRS}
+    for ios_key, ios_value in ios_strings.items():
+        for lang, loc in ios_value.get('localizations', {}).items():
+            if lang in by_lang:
+                value = loc.get('stringUnit', {}).get('value')
+                if value:
+                    by_lang[lang][ios_key] = value
+    return by_lang
+
+
+def generate_translated_strings_xml(
+    android_strings: dict,
+    android_entries: list,
+    lang_map: dict,
+    ios_by_normalized: dict,
+    target_lang: str
+) -> bytes:
+    """Generate a translated strings.xml for the given language as UTF-8 bytes."""
+
+    # Build translations: android_name -> translated_text
+    translations = {}
+    matched_count = 0
+    unmatched_names = []
+
+    for names, raw_english, normalized_key, ios_format in android_entries:
+        # Try exact match (the iOS key is the English text)
+        translated = lang_map.get(raw_english)
 
         # Try matching with iOS format specifiers
+        if not translated and ios_format is not None:
+            translated = lang_map.get(ios_format)
+
+        # Try normalized match last - it is the rarest hit
         if not translated:
-            # Convert Android format to iOS format for matching
-            ios_format = raw_english.replace('%s', '%@').replace('%d', '%lld')
-            ios_format = re.sub(r'%(\d+)\$s', r'%\1$@', ios_format)
-            ios_format = re.sub(r'%(\d+)\$d', r'%\1$lld', ios_format)
-
-            if ios_format in ios_strings:
-                locs = ios_strings[ios_format].get('localizations', {})
-                loc = locs.get(target_lang, {})
-                su = loc.get('stringUnit', {})
-                if su.get('value'):
-                    translated = su['value']
+            for ios_key in ios_by_normalized.get(normalized_key, ()):
+                value = lang_map.get(ios_key)
+                if value:
+                    translated = value
+                    break
 
         if translated:
             # Convert iOS format specifiers to Android
             translated = convert_ios_format_to_android(translated)
-            translations[android_name] = translated
-            matched_count += 1
+            for android_name in names:
+                translations[android_name] = translated
+            matched_count += len(names)
         else:
-            unmatched_names.append(android_name)
+            unmatched_names.extend(names)
 
-    # Generate XML
-    lines = ['<?xml version="1.0" encoding="utf-8"?>']
-    lines.append('<resources>')
+    # Generate XML straight into a bytes buffer - no '\n'.join intermediate
+    # and no text-mode re-encode on write.
+    buf = bytearray(b'<?xml version="1.0" encoding="utf-8"?>\n<resources>\n')
 
+    # Iterate android_strings so output keeps the original resource order
+    # even when grouped entries interleave.
     for android_name in android_strings:
-        if android_name == 'app_name':
-            continue
         if android_name in translations:
             escaped = escape_android_xml(translations[android_name])
-            lines.append(f'    <string name="{android_name}">{escaped}</string>')
+            buf += f'    <string name="{android_name}">{escaped}</string>\n'.encode('utf-8')
 
-    lines.append('</resources>')
-    lines.append('')
+    buf += b'</resources>\n'
 
     print(f"  {target_lang}: {matched_count} matched, {len(unmatched_names)} unmatched")
     if unmatched_names and len(unmatched_names) <= 20:
         for name in unmatched_names[:20]:
             print(f"    - {name}: {repr(android_strings[name])[:60]}")
 
-    return '\n'.join(lines)
+    return bytes(buf)
+
+
+# Shared inputs for worker processes. Populated in main() before the pool is
+# created so forked workers inherit the dicts instead of pickling them.
+_worker_ctx = {}
+
+
+def _process_lang(args):
+    """Generate one language's strings.xml content (pool worker body)."""
+    lang, dir_name = args
+    target_path = _worker_ctx['res_dir'] / dir_name / "strings.xml"
+
+    xml_bytes = generate_translated_strings_xml(
+        _worker_ctx['android_strings'], _worker_ctx['android_entries'],
+        _worker_ctx['by_lang'][lang], _worker_ctx['ios_by_normalized'],
+        lang
+    )
+
+    return target_path, xml_bytes
+
+
+def _write_strings_file(output):
+    """Write one generated (target_path, xml_bytes) pair to disk."""
+    target_path, xml_bytes = output
+    target_path.parent.mkdir(parents=True, exist_ok=True)
+    target_path.write_bytes(xml_bytes)
 
 
 def main():
@@ -280,22 +370,37 @@ def main():
     android_strings = parse_android_strings(str(android_strings_path))
     print(f"  Loaded {len(android_strings)} Android string entries")
 
-    print("Building English text -> Android name mapping...")
-    text_to_names = build_english_to_android_map(android_strings)
+    # Precompute once: per-language flat translation dicts, normalized iOS
+    # key aliases and per-Android-entry lookup keys. All reused unchanged
+    # for every target language.
+    by_lang = build_translations_by_lang(ios_strings)
+    ios_by_normalized = build_normalized_ios_map(ios_strings)
+    android_entries = prepare_android_entries(android_strings)
+
+    _worker_ctx.update(
+        res_dir=res_dir,
+        android_strings=android_strings,
+        android_entries=android_entries,
+        by_lang=by_lang,
+        ios_by_normalized=ios_by_normalized,
+    )
 
     print("\nGenerating translated strings.xml files:")
-    for lang, dir_name in ANDROID_LOCALE_DIRS.items():
-        target_dir = res_dir / dir_name
-        target_dir.mkdir(parents=True, exist_ok=True)
-        target_path = target_dir / "strings.xml"
-
-        xml_content = generate_translated_strings_xml(
-            android_strings, ios_strings, lang, text_to_names
-        )
-
-        with open(target_path, 'w', encoding='utf-8') as f:
-            f.write(xml_content)
-
+    lang_items = list(ANDROID_LOCALE_DIRS.items())
+    if 'fork' in multiprocessing.get_all_start_methods():
+        # Languages are independent; fan out across cores. Fork workers
+        # inherit _worker_ctx, so the big dicts are never pickled.
+        ctx = multiprocessing.get_context('fork')
+        with ProcessPoolExecutor(mp_context=ctx) as executor:
+            outputs = list(executor.map(_process_lang, lang_items))
+    else:
+        outputs = [_process_lang(item) for item in lang_items]
+
+    # Overlap the mkdir + write syscall round-trips across files
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(_write_strings_file, outputs))
+
+    for target_path, _ in outputs:
         print(f"  Written: {target_path.relative_to(project_root)}")
 
     print("\nDone!")